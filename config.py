@@ -17,6 +17,11 @@ ADX_FLAT_THRESHOLD          = 15    # ADX value to detect flat/range markets
 VOLUME_SPIKE_MULTIPLIER     = 1.2   # Multiplier to detect volume spikes
 ATR_PERIOD                  = 14    # ATR calculation period
 
+# ------------------------------------------------------------------
+# ⚡ Concurrency (also sizes the shared Binance HTTP connection pool)
+MAX_SYMBOL_WORKERS          = 8     # Symbols analysed in parallel by main
+KLINES_PER_SYMBOL           = 3     # Klines requests in flight per symbol (15m, 1h, 4h in check_entry)
+
 # ------------------------------------------------------------------
 # 🧪 Scenario validation parameters (formerly RR / stop-loss / take-profit logic)
 STRUCTURAL_TARGET_RATIO     = 3.0   # Former TP_SL_RATIO, ratio between structural limit and structural target
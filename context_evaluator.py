@@ -8,26 +8,53 @@ No trades are executed. These counters serve to track
 how often scenarios are rejected or accepted based on analysis conditions.
 """
 
+import atexit
 import csv
+import threading
 from pathlib import Path
-from threading import Lock
 from config import DAILY_REJECTION_LIMIT, MAX_CONSECUTIVE_REJECTIONS, LOG_PATH
 from datetime import datetime
 
+try:
+    from fastrlock.rlock import FastRLock as Lock  # cheaper uncontended acquire/release
+except ImportError:
+    from threading import Lock
+
 _FILE_LOCK = Lock()
+_LOG_HEADER = ("date", "symbol", "scenario_status")
+_LOG_BUFFER_SIZE = 8192   # bytes buffered by the long-lived log handle
+_FLUSH_MAX_ROWS = 64      # flush synchronously once this many rows are pending
+_FLUSH_INTERVAL = 2.0     # seconds between background flushes
+
+_TAIL_CHUNK = 64 * 1024   # bytes read per step when scanning the log backwards
 
 def _TODAY_UTC() -> str:
     return datetime.utcnow().strftime("%Y-%m-%d")
 
-def _write_csv_row(path: str | Path, row: dict, header: list[str]) -> None:
+def _iter_lines_reversed(path: Path):
+    """Yields the lines of a file as bytes, last line first."""
+    with path.open("rb") as f:
+        pos = f.seek(0, 2)
+        tail = b""
+        while pos > 0:
+            step = min(_TAIL_CHUNK, pos)
+            pos -= step
+            f.seek(pos)
+            lines = (f.read(step) + tail).split(b"\n")
+            tail = lines.pop(0)
+            for line in reversed(lines):
+                yield line.rstrip(b"\r")
+        yield tail.rstrip(b"\r")
+
+def _open_log(path: str | Path):
+    """Opens the scenario log for appending, writing the header to a new file."""
     path = Path(path)
-    with _FILE_LOCK:
-        file_exists = path.exists()
-        with path.open("a", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=header)
-            if not file_exists:
-                writer.writeheader()
-            writer.writerow(row)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fh = path.open("a", newline="", buffering=_LOG_BUFFER_SIZE)
+    writer = csv.writer(fh)
+    if fh.tell() == 0:
+        writer.writerow(_LOG_HEADER)
+    return fh, writer
 
 class ContextEvaluator:
     """Tracks rejection counters for scenario validation (analysis hygiene)."""
@@ -35,7 +62,14 @@ class ContextEvaluator:
     def __init__(self) -> None:
         self.daily_rejection_count: int = 0
         self.consecutive_rejections: int = 0
+        self._pending_rows: int = 0
         self._load_today_stats()
+        self._fh, self._writer = _open_log(LOG_PATH)
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically,
+                                         name="scenario-log-flush", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
 
     def check_daily_rejection_limit(self) -> bool:
         if self.daily_rejection_count >= abs(DAILY_REJECTION_LIMIT):
@@ -54,38 +88,68 @@ class ContextEvaluator:
         Records whether a scenario was accepted or rejected.
         Used for internal evaluation of analysis hygiene.
         """
-        row = {
-            "date": date_utc,
-            "symbol": symbol,
-            "scenario_status": scenario_status.upper(),
-        }
-        _write_csv_row(LOG_PATH, row, header=["date", "symbol", "scenario_status"])
+        status = scenario_status.upper()
+        with _FILE_LOCK:
+            self._writer.writerow((date_utc, symbol, status))
+            self._pending_rows += 1
+            if self._pending_rows >= _FLUSH_MAX_ROWS:
+                self._fh.flush()
+                self._pending_rows = 0
 
         today = _TODAY_UTC()
         if date_utc != today:
             return
 
-        if scenario_status.upper() == "REJECTED":
+        if status == "REJECTED":
             self.daily_rejection_count += 1
             self.consecutive_rejections += 1
-        elif scenario_status.upper() == "ACCEPTED":
+        elif status == "ACCEPTED":
             self.consecutive_rejections = 0
 
+    def flush(self) -> None:
+        """Pushes rows still held in the log handle's buffer to LOG_PATH."""
+        with _FILE_LOCK:
+            if self._pending_rows and not self._fh.closed:
+                self._fh.flush()
+                self._pending_rows = 0
+
+    def close(self) -> None:
+        """Flushes and closes the scenario log (registered with atexit)."""
+        self._closed.set()
+        with _FILE_LOCK:
+            if not self._fh.closed:
+                self._fh.close()
+            self._pending_rows = 0
+
+    def _flush_periodically(self) -> None:
+        # one long-lived thread; close() sets the event to end it
+        while not self._closed.wait(_FLUSH_INTERVAL):
+            self.flush()
+
     def _load_today_stats(self) -> None:
+        """
+        Restores today's counters by reading the log backwards from its end,
+        stopping at the first row that belongs to an earlier day.
+        """
         path = Path(LOG_PATH)
         if not path.exists():
             return
-        today = _TODAY_UTC()
-        with path.open("r", newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row.get("date") != today:
-                    continue
-                if row.get("scenario_status", "").upper() == "REJECTED":
-                    self.daily_rejection_count += 1
-                    self.consecutive_rejections += 1
-                elif row.get("scenario_status", "").upper() == "ACCEPTED":
-                    self.consecutive_rejections = 0
+        today = _TODAY_UTC().encode()
+        rejected = 0
+        since_accepted = None
+        for line in _iter_lines_reversed(path):
+            if not line:
+                continue
+            fields = line.split(b",", 2)
+            if fields[0] != today:
+                break
+            status = fields[-1].strip().upper()
+            if status == b"REJECTED":
+                rejected += 1
+            elif status == b"ACCEPTED" and since_accepted is None:
+                since_accepted = rejected
+        self.daily_rejection_count += rejected
+        self.consecutive_rejections = rejected if since_accepted is None else since_accepted
 
     def reset_counters(self) -> None:
         """Reset daily scenario counters (should be called at UTC midnight)."""
@@ -1,4 +1,8 @@
-from exchange.api import BinanceWrapper
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+
+from exchange.api import binance
 from utils.logger import log_signal, debug_entry_log
 from indicators import (
     calculate_trend,
@@ -6,44 +10,57 @@ from indicators import (
     calculate_normalized_macd,
     calculate_candle_stats,
     calculate_atr,
+    calculate_atrs,
     evaluate_direction,
     assess_confidence,
     classify_market_mode
 )
-from entry_filter_retest import entry_filter_retest
+from entry_filter_retest import entry_filter_retest, classify_reasons
 from risk_utils import select_structural_limit, select_structural_target
 from trendline_detector import TrendlineDetector
 
+# (interval, limit) fetched concurrently for every evaluation
+KLINE_SPECS = (("15m", 20), ("1h", 50), ("4h", 50))
+
 def check_entry(symbol, key_levels, scenario_evaluator):
     print(f"\n▶️ Starting structural evaluation for {symbol}")
 
-   
-    binance = BinanceWrapper()
-    klines_15m = binance.get_klines(symbol, interval='15m', limit=20)
-    klines_1h = binance.get_klines(symbol, interval='1h', limit=50)
-    klines_4h = binance.get_klines(symbol, interval='4h', limit=50)
-
-    if not klines_15m or not klines_1h or not klines_4h:
-        print(f"⛔ EXIT EARLY: Not enough data available for {symbol}")
-        return None
-
-    closes_15m = [float(k[4]) for k in klines_15m]
-    volumes_15m = [float(k[5]) for k in klines_15m]
-    highs_15m = [float(k[2]) for k in klines_15m]
-    lows_15m = [float(k[3]) for k in klines_15m]
-    closes_1h = [float(k[4]) for k in klines_1h]
-    closes_4h = [float(k[4]) for k in klines_4h]
-    highs_1h = [float(k[2]) for k in klines_1h]
-    lows_1h = [float(k[3]) for k in klines_1h]
-    current_price = closes_15m[-1]
-
-    atr = calculate_atr(highs_15m, lows_15m, closes_15m, period=5)
-    atr_slow = calculate_atr(highs_15m, lows_15m, closes_15m, period=15)
+    pool = ThreadPoolExecutor(max_workers=len(KLINE_SPECS))
+    futures = {
+        pool.submit(binance.get_klines, symbol, interval, limit): interval
+        for interval, limit in KLINE_SPECS
+    }
+    klines = {}
+    try:
+        for future in as_completed(futures):
+            data = future.result()
+            if not data:
+                # don't wait for the other timeframes, nothing is parsed yet
+                print(f"⛔ EXIT EARLY: Not enough data available for {symbol}")
+                return None
+            klines[futures[future]] = data
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    klines_15m, klines_1h, klines_4h = (klines[interval] for interval, _ in KLINE_SPECS)
+
+    klines_15m_np = np.asarray(klines_15m, dtype=np.float64)
+    highs_15m = klines_15m_np[:, 2]
+    lows_15m = klines_15m_np[:, 3]
+    closes_15m = klines_15m_np[:, 4]
+    volumes_15m = klines_15m_np[:, 5]
+    klines_1h_np = np.asarray(klines_1h, dtype=np.float64)
+    highs_1h = klines_1h_np[:, 2]
+    lows_1h = klines_1h_np[:, 3]
+    closes_1h = klines_1h_np[:, 4]
+    closes_4h = np.asarray(klines_4h, dtype=np.float64)[:, 4]
+    current_price = float(closes_15m[-1])
+
+    atr, atr_slow = calculate_atrs(highs_15m, lows_15m, closes_15m, periods=(5, 15))
     atr_1h = calculate_atr(highs_1h, lows_1h, closes_1h)
     trend_1h = calculate_trend(closes_1h, atr_1h)
     trend_4h = calculate_trend(closes_4h, atr_1h)
     market_mode = classify_market_mode(trend_1h, atr, atr_slow, volumes_15m)
-    last_candle = klines_15m[-1]
+    last_candle = klines_15m_np[-1]
     candle_stats = calculate_candle_stats(last_candle, atr, volumes_15m)
 
     swing_high = key_levels.get("swing_high")
@@ -65,27 +82,34 @@ def check_entry(symbol, key_levels, scenario_evaluator):
 
     detector = TrendlineDetector(binance)
     trendlines = detector.detect_trendlines_multi(symbol)
-    for tf in ["15m", "1h"]:
-        for side in ["up", "down"]:
-            key_levels[f"trendline_{tf}_{side}"] = trendlines.get(tf, {}).get(f"{side}_trendline")
-
-    breakout_reasons = detector.check_trendline_breakout(current_price, direction, key_levels)
+    tl_cache = {}
+    for tf in ("15m", "1h"):
+        tf_lines = trendlines.get(tf, {})
+        for side in ("up", "down"):
+            line = tf_lines.get(f"{side}_trendline")
+            key_levels[f"trendline_{tf}_{side}"] = line
+            tl_cache[(tf, side)] = line
+
+    breakout_reasons = detector.check_trendline_breakout(
+        current_price, direction, key_levels, flat=detector.flatten_trendlines(tl_cache)
+    )
     reasons.extend(breakout_reasons)
+    is_breakout, breakout_confirmed = classify_reasons(reasons)
 
     trendline_breakout = None
     trendline_target = None
     if direction == "LONG":
-        for tf in ["15m", "1h"]:
-            up = key_levels.get(f"trendline_{tf}_up")
-            down = key_levels.get(f"trendline_{tf}_down")
+        for tf in ("15m", "1h"):
+            up = tl_cache[(tf, "up")]
+            down = tl_cache[(tf, "down")]
             if up and current_price > up.get("price_now", 0):
                 trendline_breakout = up.get("price_now")
             if down:
                 trendline_target = down.get("price_now")
     elif direction == "SHORT":
-        for tf in ["15m", "1h"]:
-            down = key_levels.get(f"trendline_{tf}_down")
-            up = key_levels.get(f"trendline_{tf}_up")
+        for tf in ("15m", "1h"):
+            down = tl_cache[(tf, "down")]
+            up = tl_cache[(tf, "up")]
             if down and current_price < down.get("price_now", float("inf")):
                 trendline_breakout = down.get("price_now")
             if up:
@@ -108,7 +132,6 @@ def check_entry(symbol, key_levels, scenario_evaluator):
     if structural_limit is None:
         return {"status": "skip", "reason": "No valid structural limit found", "atr": atr}
 
-    is_breakout = any("breakout" in r or "exit" in r for r in reasons)
     structural_target, partial_target, dynamic_target = select_structural_target(
         entry_price=current_price,
         structural_limit=structural_limit,
@@ -127,7 +150,7 @@ def check_entry(symbol, key_levels, scenario_evaluator):
     rr = abs(structural_target - current_price) / abs(current_price - structural_limit)
 
     macd_data = calculate_normalized_macd(closes_1h)
-    volume_profile = calculate_volume_profile(klines_15m)
+    volume_profile = calculate_volume_profile(klines_15m_np)
 
     confidence, confidence_reasons = assess_confidence(
         direction=direction,
@@ -157,7 +180,8 @@ def check_entry(symbol, key_levels, scenario_evaluator):
         confidence=confidence,
         debug=False,
         retest_age=0,
-        reasons=reasons
+        reasons=reasons,
+        breakout_confirmed=breakout_confirmed
     )
     if retest_check:
         print(f"💡 Retest filter activated for {symbol}: {retest_check.get('reason', 'Reason not specified')}")
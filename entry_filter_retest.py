@@ -1,5 +1,30 @@
 import numpy as np
 
+# Reasons that confirm a breakout — the overheated filter is not applied then
+BREAKOUT_REASON_TOKENS = ("breakout", "exit from low-volume area")
+
+# Case-sensitive substrings check_entry treats as a breakout when picking targets
+TARGET_BREAKOUT_TOKENS = ("breakout", "exit")
+
+def _is_breakout_reason(reason: str) -> bool:
+    reason = reason.lower()
+    return any(token in reason for token in BREAKOUT_REASON_TOKENS)
+
+def classify_reasons(reasons) -> tuple[bool, bool]:
+    """
+    Scans the reasons once and returns (is_breakout, breakout_confirmed):
+    the structural-target breakout flag and the overheated-filter bypass flag.
+    """
+    is_breakout = breakout_confirmed = False
+    for r in reasons:
+        if not is_breakout and any(token in r for token in TARGET_BREAKOUT_TOKENS):
+            is_breakout = True
+        if not breakout_confirmed and _is_breakout_reason(r):
+            breakout_confirmed = True
+        if is_breakout and breakout_confirmed:
+            break
+    return is_breakout, breakout_confirmed
+
 def entry_filter_retest(
     direction,
     current_price,
@@ -17,14 +42,15 @@ def entry_filter_retest(
     confidence=None,
     debug=False,
     retest_age=0,
-    reasons: list = None
+    reasons: list = None,
+    breakout_confirmed: bool | None = None
 ):
-    if reasons:
-        reason_str = " ".join(reasons).lower()
-        if "breakout" in reason_str or "exit from low-volume area" in reason_str:
-            if debug:
-                print("✅ Breakout confirmed — overheated filter is not applied")
-            return None
+    if breakout_confirmed is None:
+        breakout_confirmed = bool(reasons) and any(_is_breakout_reason(r) for r in reasons)
+    if breakout_confirmed:
+        if debug:
+            print("✅ Breakout confirmed — overheated filter is not applied")
+        return None
 
     last_3_closes = closes_15m[-4:]  # always the last three closed candles
     confirm = (
@@ -41,15 +67,16 @@ def entry_filter_retest(
         return None
 
     # Additional candle body filter (overheated condition)
-    body_sizes = [abs(closes_15m[i] - closes_15m[i - 1]) for i in range(-3, 0)]
-    if retest_age > 0 and max(body_sizes) > atr * 1.2 and not confirm:
-        if debug:
-            print("💥 Overheated based on candle bodies:", body_sizes)
-        return {
-            "status": "skip",
-            "reason": "body stretch — evaluation too late",
-            "atr": atr
-        }
+    if retest_age > 0 and not confirm:
+        body_sizes = np.abs(np.diff(last_3_closes))
+        if body_sizes.max() > atr * 1.2:
+            if debug:
+                print("💥 Overheated based on candle bodies:", body_sizes)
+            return {
+                "status": "skip",
+                "reason": "body stretch — evaluation too late",
+                "atr": atr
+            }
 
     if direction == "LONG":
         impulse_phase = swing_high < current_price <= swing_high + atr * 0.3
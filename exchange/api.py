@@ -1,21 +1,61 @@
 from __future__ import annotations
+import functools
 import json
 import hashlib
 import hmac
+import threading
 import time
-from typing import Any, Dict, Final, Optional
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Final, Optional
 from urllib.parse import quote_plus
 
 import requests
 from requests.adapters import HTTPAdapter, Retry
 
-from config import API_KEY, API_SECRET
+from config import API_KEY, API_SECRET, KLINES_PER_SYMBOL, MAX_SYMBOL_WORKERS
+from utils.fastjson import loads
 from utils.logger import logger
 
 # ------------------------------------------------------------------
 TIMEOUT: Final[int] = 5        # seconds per HTTP request
 BASE_URL: Final[str] = "https://open-api.bingx.com"
 
+# Retry is immutable and safe to share; each session still needs its own adapter
+_RETRY: Final[Retry] = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(500, 502, 503, 504),
+    allowed_methods=("GET", "POST"),
+)
+
+
+def _make_adapter(**pool_kwargs: int | bool) -> HTTPAdapter:
+    return HTTPAdapter(max_retries=_RETRY, **pool_kwargs)
+
+
+def _make_query_builder(ordered_keys: tuple[str, ...],
+                        unquoted: tuple[str, ...] = ()) -> Callable[[dict], str]:
+    """
+    Returns a function that renders params into the signing query string for a
+    fixed key order. Keys in `unquoted` hold plain digits and skip quote_plus.
+    """
+    parts = tuple(
+        (f"&{key}=" if i else f"{key}=", key, key not in unquoted)
+        for i, key in enumerate(ordered_keys)
+    )
+
+    def build(params: dict) -> str:
+        return "".join(
+            prefix + (quote_plus(params[key]) if quote else params[key])
+            for prefix, key, quote in parts
+        )
+
+    return build
+
+
+_BALANCE_QUERY = _make_query_builder(("recvWindow", "timestamp"), unquoted=("recvWindow", "timestamp"))
+_PRICE_QUERY = _make_query_builder(("symbol", "recvWindow", "timestamp"), unquoted=("recvWindow", "timestamp"))
+
 
 class BingXAPI:
     """Lightweight wrapper around BingX swap endpoints (signed)."""
@@ -23,21 +63,17 @@ class BingXAPI:
     def __init__(self, api_key: str, api_secret: str) -> None:
         self.api_key = api_key
         self.api_secret = api_secret.encode()
+        # keyed HMAC state (ipad/opad already absorbed); copied for every signature
+        self._hmac_template = hmac.new(self.api_secret, b"", hashlib.sha256)
 
         # single Session with retry policy
         self.session = requests.Session()
-        retry = Retry(
-            total=3,
-            backoff_factor=0.5,
-            status_forcelist=(500, 502, 503, 504),
-            allowed_methods=("GET", "POST"),
-        )
-        adapter = HTTPAdapter(max_retries=retry)
-        self.session.mount("https://", adapter)
+        self.session.mount("https://", _make_adapter())
 
     def _sign(self, query: str) -> str:
-        signature = hmac.new(self.api_secret, query.encode("utf-8"), hashlib.sha256).hexdigest()
-        return signature
+        mac = self._hmac_template.copy()
+        mac.update(query.encode("utf-8"))
+        return mac.hexdigest()
 
     def _headers(self) -> Dict[str, str]:
         return {
@@ -50,7 +86,8 @@ class BingXAPI:
         method: str,
         path: str,
         params: Optional[dict] = None,
-        ordered_keys: Optional[list[str]] = None
+        ordered_keys: Optional[list[str]] = None,
+        query: Optional[Callable[[dict], str]] = None
     ) -> dict:
         if params is None:
             params = {}
@@ -58,7 +95,9 @@ class BingXAPI:
         for k, v in params.items():
             params[k] = str(v).lower() if isinstance(v, bool) else str(v)
 
-        if ordered_keys:
+        if query:
+            query_string = query(params)
+        elif ordered_keys:
             for key in ordered_keys:
                 if key not in params:
                     raise KeyError(f"Missing expected param: '{key}' for signing")
@@ -77,7 +116,7 @@ class BingXAPI:
                 response = self.session.get(url, headers=headers, params=params, timeout=TIMEOUT)
             else:
                 response = self.session.post(url, headers=headers, data=params, timeout=TIMEOUT)
-            return response.json()
+            return loads(response.content)
         except ValueError:
             logger.error("Non-JSON response from BingX: %s", response.text)
             return {"code": -1, "msg": response.text}
@@ -92,9 +131,9 @@ class BingXAPI:
             "/openApi/swap/v2/user/balance",
             {
                 "recvWindow": "60000",
-                "timestamp": str(int(time.time() * 1000))
+                "timestamp": str(time.time_ns() // 1_000_000)
             },
-            ["recvWindow", "timestamp"]
+            query=_BALANCE_QUERY
         )
 
     def get_price(self, symbol: str) -> Dict[str, Any]:
@@ -104,27 +143,71 @@ class BingXAPI:
             {
                 "symbol": symbol,
                 "recvWindow": "60000",
-                "timestamp": str(int(time.time() * 1000))
+                "timestamp": str(time.time_ns() // 1_000_000)
             },
-            ["symbol", "recvWindow", "timestamp"]
+            query=_PRICE_QUERY
         )
 
-    
-
-api = BingXAPI(API_KEY, API_SECRET)
-
-
 
 
 # ---------------------------------------------------------------------------
 # Binance klines helper reusing same session (no key required)
 # ---------------------------------------------------------------------------
 
+# seconds a klines response stays fresh; other intervals are always refetched
+KLINE_CACHE_TTL: Final[Dict[str, float]] = {"15m": 30, "1h": 60, "4h": 300}
+
+
+def _ttl_cache(maxsize: int, ttl_seconds: Callable[[str], float]):
+    """
+    LRU + TTL memoizer for get_klines(symbol, interval, limit).
+    Entries expire after ttl_seconds(interval); empty responses are not cached.
+    """
+    def decorator(func):
+        cache: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(self, symbol: str, interval: str = "1h", limit: int = 200):
+            ttl = ttl_seconds(interval)
+            if ttl <= 0:
+                return func(self, symbol, interval, limit)
+
+            key = (symbol, interval, limit)
+            now = time.monotonic()
+            with lock:
+                hit = cache.get(key)
+                if hit is not None and now - hit[0] < ttl:
+                    cache.move_to_end(key)
+                    return hit[1]
+
+            value = func(self, symbol, interval, limit)
+            if value:
+                with lock:
+                    cache[key] = (now, value)
+                    cache.move_to_end(key)
+                    while len(cache) > maxsize:
+                        cache.popitem(last=False)
+            return value
+
+        return wrapper
+    return decorator
+
+
 class BinanceWrapper:
     def __init__(self):
         self.session = requests.Session()
+        # shared by every caller: one keep-alive slot per concurrent fetch
+        # (each symbol worker runs its klines requests in parallel); block
+        # rather than open throwaway sockets if a burst still exceeds it
+        self.session.mount("https://", _make_adapter(
+            pool_connections=16,
+            pool_maxsize=MAX_SYMBOL_WORKERS * KLINES_PER_SYMBOL,
+            pool_block=True,
+        ))
         self.kline_url = "https://api.binance.com/api/v3/klines"
 
+    @_ttl_cache(maxsize=128, ttl_seconds=lambda interval: KLINE_CACHE_TTL.get(interval, 0))
     def get_klines(self, symbol: str, interval: str = "1h", limit: int = 200):
         s = symbol.replace("-", "")
         try:
@@ -134,8 +217,8 @@ class BinanceWrapper:
                 timeout=TIMEOUT,
             )
             r.raise_for_status()
-            return r.json()
-        except requests.RequestException as e:
+            return loads(r.content)
+        except (requests.RequestException, ValueError) as e:
             logger.error("Binance klines error: %s", e)
             return None
 
@@ -2,56 +2,117 @@
 # Helper module (same file for convenience) — production: split into exchange_info.py
 # ---------------------------------------------------------------------------
 
+import os
+import tempfile
+import time
+from decimal import Decimal, ROUND_FLOOR
+from pathlib import Path
+
 import requests
-from math import floor
+
+from utils.fastjson import loads
+
+EXCHANGE_INFO_CACHE_PATH = Path("data/exchange_info.json")
+EXCHANGE_INFO_TTL = 300   # seconds before the on-disk copy is refetched
 
 class ExchangeInfo:
     """Lightweight cache of precision / stepSize per symbol."""
 
     def __init__(self):
         self._cache: dict[str, dict] = {}
+        self._raw: dict | None = None
+        self._all_symbols: dict[str, dict] | None = None
         self._binance_info_url = "https://api.binance.com/api/v3/exchangeInfo"
 
+    def _load_exchange_info(self) -> dict:
+        """Returns the full exchangeInfo payload, from disk if it is fresh enough."""
+        if self._raw is not None:
+            return self._raw
+
+        path = EXCHANGE_INFO_CACHE_PATH
+        try:
+            if time.time() - path.stat().st_mtime < EXCHANGE_INFO_TTL:
+                self._raw = loads(path.read_bytes())
+                return self._raw
+        except (OSError, ValueError):
+            pass
+
+        response = requests.get(self._binance_info_url, timeout=5)
+        data = loads(response.content)
+        if "symbols" not in data:
+            return data  # error payload, don't keep or persist it
+        self._raw = data
+
+        # atomic replace so a concurrent reader never sees a partial file;
+        # the disk copy is only an optimisation, so a failed write is ignored
+        tmp = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(response.content)
+            os.replace(tmp, path)
+        except OSError:
+            if tmp is not None:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+        return self._raw
+
+    def _symbol_index(self) -> dict[str, dict]:
+        """Maps "BTCUSDT" → its exchangeInfo entry; built once per payload."""
+        if self._all_symbols is not None:
+            return self._all_symbols
+        data = self._load_exchange_info()
+        index = {itm.get("symbol"): itm for itm in data.get("symbols", [])}
+        if self._raw is not None:
+            self._all_symbols = index
+        return index
+
     def _fetch_symbol(self, symbol: str) -> dict:
         # Convert "BTC-USDT" → "BTCUSDT"
         s = symbol.replace("-", "")
         if s in self._cache:
             return self._cache[s]
 
-        data = requests.get(self._binance_info_url, timeout=5).json()
-        for itm in data.get("symbols", []):
-            if itm.get("symbol") == s:
-                # Precision parameters from Binance
-                price_precision = itm.get("quotePrecision", 8)
-
-                # Lot step (LOT_SIZE)
-                lot_filter = next(
-                    (f for f in itm.get("filters", []) if f.get("filterType") == "LOT_SIZE"),
-                    {}
-                )
-                qty_step = float(lot_filter.get("stepSize", 1e-8))
-
-                # Minimum notional (MIN_NOTIONAL), if any
-                notional_filter = next(
-                    (f for f in itm.get("filters", []) if f.get("filterType") == "MIN_NOTIONAL"),
-                    None
-                )
-                min_notional = (
-                    float(notional_filter["minNotional"])
-                    if notional_filter and "minNotional" in notional_filter
-                    else 0.0
-                )
-
-                precisions = {
-                    "price_precision": price_precision,
-                    "qty_step":         qty_step,
-                    "min_notional":     min_notional,
-                }
-
-                self._cache[s] = precisions
-                return precisions
-
-        raise ValueError(f"Symbol {symbol} not found in exchangeInfo")
+        itm = self._symbol_index().get(s)
+        if itm is None:
+            raise ValueError(f"Symbol {symbol} not found in exchangeInfo")
+
+        # Precision parameters from Binance
+        price_precision = itm.get("quotePrecision", 8)
+
+        # Lot step (LOT_SIZE)
+        lot_filter = next(
+            (f for f in itm.get("filters", []) if f.get("filterType") == "LOT_SIZE"),
+            {}
+        )
+        step_str = str(lot_filter.get("stepSize", "0.00000001"))
+        qty_step = float(step_str)
+        # exact decimal step for round_qty ("0.001", "0.5", "10" alike)
+        qty_step_dec = Decimal(step_str)
+
+        # Minimum notional (MIN_NOTIONAL), if any
+        notional_filter = next(
+            (f for f in itm.get("filters", []) if f.get("filterType") == "MIN_NOTIONAL"),
+            None
+        )
+        min_notional = (
+            float(notional_filter["minNotional"])
+            if notional_filter and "minNotional" in notional_filter
+            else 0.0
+        )
+
+        precisions = {
+            "price_precision": price_precision,
+            "qty_step":         qty_step,
+            "qty_step_dec":     qty_step_dec,
+            "min_notional":     min_notional,
+        }
+
+        self._cache[s] = precisions
+        return precisions
 
 
     # ----------------- rounding helpers -----------------
@@ -65,5 +126,7 @@ class ExchangeInfo:
 
     def round_qty(self, symbol: str, qty: float) -> float:
         info = self._fetch_symbol(symbol)
-        step = info["qty_step"]
-        return floor(qty / step) * step
\ No newline at end of file
+        step = info["qty_step_dec"]
+        # floor to the step in decimal: float math turns 0.282 into 0.28199999
+        qty_dec = Decimal(str(float(qty)))
+        return float((qty_dec / step).to_integral_value(rounding=ROUND_FLOOR) * step)
\ No newline at end of file
@@ -2,7 +2,7 @@
 # -----------------------------------------------------------------------------
 # This file fully replaces the previous version. It includes:
 #   • all calculations return scalars (no np.ndarray output);
-#   • assess_confidence works reliably thanks to _sanitize();
+#   • assess_confidence receives plain floats from volume_profile;
 #   • TrueRange / ATR, EMA, MACD — implemented without length distortion;
 #   • volume_profile adapts bin_size to price volatility;
 #   • evaluate_direction no longer mutates input structures.
@@ -10,49 +10,108 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
+from functools import lru_cache
 from typing import List, Dict, Tuple
 
 import numpy as np
 
+from utils.logger import logger
+
+try:
+    from scipy.signal import lfilter
+except ImportError:  # SciPy is optional — _ema falls back to a Python loop
+    lfilter = None
+
 # ------------------------------------------------------------------
 # generic helpers
 # ------------------------------------------------------------------
 
-def _sanitize(obj):
-    if isinstance(obj, np.ndarray):
-        return float(obj.item()) if obj.size == 1 else [_sanitize(x) for x in obj.tolist()]
-    if isinstance(obj, (list, tuple)):
-        return [_sanitize(x) for x in obj]
-    return obj
+@lru_cache(maxsize=16)
+def _ewm_coefs(alpha: float) -> Tuple[np.ndarray, np.ndarray]:
+    """lfilter (b, a) for y[i] = alpha*x[i] + (1-alpha)*y[i-1]; read-only, shared."""
+    b = np.array([alpha])
+    a = np.array([1.0, alpha - 1.0])
+    b.flags.writeable = a.flags.writeable = False
+    return b, a
+
+
+def _ewm(arr: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Exponential smoothing y[i] = alpha*x[i] + (1-alpha)*y[i-1], y[0] = x[0]
+    (same as pandas ewm(alpha=alpha, adjust=False).mean()).
+    """
+    beta = 1 - alpha
+    x = np.asarray(arr, dtype=np.float64)
+    if lfilter is not None:
+        # first-order IIR y[i] = alpha*x[i] + beta*y[i-1], seeded so y[0] = x[0]
+        b, a = _ewm_coefs(alpha)
+        out, _ = lfilter(b, a, x, zi=[beta * x[0]])
+        return out
+
+    # The recurrence can't be vectorised; running it over plain floats avoids
+    # boxing a NumPy scalar on every read/write of the array.
+    out = x.tolist()
+    prev = out[0]
+    for i in range(1, len(out)):
+        prev = out[i] = alpha * out[i] + beta * prev
+    return np.asarray(out)
 
 
 def _ema(arr: np.ndarray, period: int) -> np.ndarray:
-    alpha = 2 / (period + 1)
-    out = np.empty_like(arr)
-    out[0] = arr[0]
-    for i in range(1, len(arr)):
-        out[i] = alpha * arr[i] + (1 - alpha) * out[i - 1]
-    return out
+    return _ewm(arr, 2 / (period + 1))
 
 
 def _true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
-    prev_close = np.roll(close, 1)
+    # previous close via a slice copy (np.roll copies and wraps around)
+    prev_close = np.empty_like(close)
     prev_close[0] = close[0]
-    return np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    prev_close[1:] = close[:-1]
+
+    # max(h - l, |h - pc|, |l - pc|) with one scratch buffer, in place
+    tr = high - low
+    gap = np.subtract(high, prev_close)
+    np.maximum(tr, np.abs(gap, out=gap), out=tr)
+    np.subtract(low, prev_close, out=gap)
+    np.maximum(tr, np.abs(gap, out=gap), out=tr)
+    return tr
 
 # ------------------------------------------------------------------
 # ATR / Trend / MACD
 # ------------------------------------------------------------------
 
-def calculate_atr(highs: List[float], lows: List[float], closes: List[float], period: int = 14) -> float:
-    if len(highs) < period + 1:
+def _wilder_atr(tr: np.ndarray, period: int) -> float:
+    if tr.size < period + 1:
         return 0.0
-    tr = _true_range(np.asarray(highs), np.asarray(lows), np.asarray(closes))
-    atr = np.convolve(tr, np.ones(period) / period, mode="valid")[-1]
+    # Wilder's smoothing (RMA): seed with the SMA of the first `period` true
+    # ranges, then atr = (atr*(period-1) + tr) / period for the rest. Only the
+    # last value is needed, so the recurrence is unrolled into one weighted sum
+    # instead of materialising the whole smoothed series.
+    beta = 1.0 - 1.0 / period
+    seed = tr[1:period + 1].mean()
+    tail = tr[period + 1:]
+    weights = beta ** np.arange(tail.size - 1, -1, -1, dtype=np.float64)
+    atr = seed * beta ** tail.size + (tail @ weights) / period
     return float(atr)
 
 
+def calculate_atrs(highs: List[float] | np.ndarray, lows: List[float] | np.ndarray,
+                   closes: List[float] | np.ndarray, periods: Tuple[int, ...]) -> Tuple[float, ...]:
+    """ATR for several periods over the same candles, sharing one true-range pass."""
+    if len(highs) < min(periods) + 1:
+        return (0.0,) * len(periods)
+    tr = _true_range(
+        np.asarray(highs, dtype=np.float64),
+        np.asarray(lows, dtype=np.float64),
+        np.asarray(closes, dtype=np.float64),
+    )
+    return tuple(_wilder_atr(tr, period) for period in periods)
+
+
+def calculate_atr(highs: List[float] | np.ndarray, lows: List[float] | np.ndarray,
+                  closes: List[float] | np.ndarray, period: int = 14) -> float:
+    return calculate_atrs(highs, lows, closes, (period,))[0]
+
+
 def calculate_trend(closes: List[float], atr: float, ema_period: int = 10) -> str:
     if len(closes) < 6:
         return "flat"
@@ -67,63 +126,76 @@ def calculate_normalized_macd(closes: List[float]) -> Dict[str, float]:
     if len(closes) < 26:
         return {}
     try:
-        c = np.asarray([float(x[0]) if isinstance(x, list) else float(x) for x in closes])
+        c = np.asarray(closes, dtype=np.float64)  # no copy for float64 arrays
+        if c.ndim > 1:
+            c = c[:, 0]
     except Exception as e:
         print("[ERROR] Error while converting closes to float:", e)
         return {}
-    macd_line = _ema(c, 12) - _ema(c, 26)
-    signal = _ema(macd_line, 9)
-    hist = macd_line - signal
+    # _ema(x, span) == pandas ewm(span=span, adjust=False).mean()
+    macd_line = _ema(c, 12)
+    macd_line -= _ema(c, 26)
+    macd = float(macd_line[-1])
+    signal = float(_ema(macd_line, 9)[-1])
     return {
-        "macd": float(macd_line[-1]),
-        "signal": float(signal[-1]),
-        "histogram": float(hist[-1])
+        "macd": macd,
+        "signal": signal,
+        "histogram": macd - signal
     }
 
 # ------------------------------------------------------------------
 # Volume Profile
 # ------------------------------------------------------------------
 
-def calculate_volume_profile(klines: List[List[str]], bin_size: float | None = None) -> Dict[str, object]:
+def calculate_volume_profile(klines: List[List[str]] | np.ndarray, bin_size: float | None = None) -> Dict[str, object]:
     if len(klines) < 3:
         return {"poc": None, "low_volume_nodes": []}
 
-    highs = np.array([float(k[2]) for k in klines])
-    lows  = np.array([float(k[3]) for k in klines])
-    vols  = np.array([float(k[5]) for k in klines])
+    arr   = np.asarray(klines, dtype=np.float64)  # no copy when already converted
+    highs = arr[:, 2]
+    lows  = arr[:, 3]
+    vols  = arr[:, 5]
     mid   = (highs + lows) / 2
 
-    price_now = float(klines[-1][4])
+    price_now = float(arr[-1, 4])
     if bin_size is None:
         tick = max(price_now * 0.001, np.mean(highs - lows) * 0.2)
         bin_size = round(tick, 6) or 0.000001
 
-    bins = np.round(mid / bin_size) * bin_size
-    vol_by_bin: Dict[float, float] = defaultdict(float)
-    for p, v in zip(bins, vols):
-        vol_by_bin[float(p)] += v
+    idx = np.round(mid / bin_size).astype(np.int64)
+    idx_min = idx.min()
+    idx -= idx_min
+    vol_by_bin = np.bincount(idx, weights=vols)
+    occupied = np.bincount(idx) > 0
+    prices = (np.arange(vol_by_bin.size) + idx_min) * bin_size
 
-    poc = max(vol_by_bin, key=vol_by_bin.get)
-    avg_v = np.mean(list(vol_by_bin.values()))
-    low_nodes = [p for p, v in vol_by_bin.items() if v < avg_v * 0.5]
+    # on ties the POC is the bin reached first in time
+    poc = prices[idx[np.argmax(vol_by_bin[idx] == vol_by_bin.max())]]
+    # empty bins hold zero volume, so the total needs no masked copy
+    avg_v = vol_by_bin.sum() / np.count_nonzero(occupied)
+    low_nodes = prices[occupied & (vol_by_bin < avg_v * 0.5)]
 
     result = {
-        "poc": float(poc) if poc is not None else None,
-        "low_volume_nodes": [float(x) for x in low_nodes],
+        "poc": float(poc),
+        "low_volume_nodes": low_nodes.tolist(),
     }
-    return _sanitize(result)
+    return result
 
 # ------------------------------------------------------------------
 # Candle stats
 # ------------------------------------------------------------------
 
-def calculate_candle_stats(candle: List[str], atr: float, volume_series: List[float]) -> Dict[str, object]:
-    o, h, l, c, v = map(float, (candle[1], candle[2], candle[3], candle[4], candle[5]))
+def calculate_candle_stats(candle: List[str] | np.ndarray, atr: float,
+                           volume_series: List[float] | np.ndarray) -> Dict[str, object]:
+    # one conversion for the OHLCV fields; tolist() hands back plain floats
+    o, h, l, c, v = np.asarray(candle[1:6], dtype=np.float64).tolist()
     body = abs(c - o)
     upper = h - max(o, c)
     lower = min(o, c) - l
-    last = volume_series[-10:] if len(volume_series) >= 10 else volume_series
-    avg_v = sum(last) / len(last)
+    # sum/len rather than mean(): an empty series raises ZeroDivisionError
+    # instead of turning into NaN and silently disabling the volume checks
+    last = np.asarray(volume_series[-10:], dtype=np.float64)
+    avg_v = float(last.sum()) / len(last)
     spike = v > avg_v * 1.6
     return {
         "body": body,
@@ -149,25 +221,31 @@ def evaluate_direction(current_price: float, swing_high: float, swing_low: float
     reasons: List[str] = []
     in_middle = swing_low < current_price < swing_high
 
+    # hoisted once: candle stats and breakout thresholds are read by several branches
+    strong_volume = candle_stats["strong_body"] and candle_stats["volume_spike"]
+    body = candle_stats["body"]
+    up_break = swing_high + 0.1 * atr
+    down_break = swing_low - 0.1 * atr
+
         # breakout conditions
     breakout_up = (
-        swing_high and current_price > swing_high + 0.1 * atr and
-        candle_stats["strong_body"] and candle_stats["volume_spike"] and trend_1h == "up"
+        swing_high and current_price > up_break and
+        strong_volume and trend_1h == "up"
     )
     breakout_down = (
-        swing_low and current_price < swing_low - 0.1 * atr and
-        candle_stats["strong_body"] and candle_stats["volume_spike"] and trend_1h == "down"
+        swing_low and current_price < down_break and
+        strong_volume and trend_1h == "down"
     )
 
     # bounce conditions
     small_bounce = 1.2
     large_bounce = 1.8
     bounce_up = (
-        swing_low and candle_stats["lower_wick"] > candle_stats["body"] * 1.5 and
+        swing_low and candle_stats["lower_wick"] > body * 1.5 and
         current_price > swing_low and trend_1h != "down"
     )
     bounce_down = (
-        swing_high and candle_stats["upper_wick"] > candle_stats["body"] * 1.5 and
+        swing_high and candle_stats["upper_wick"] > body * 1.5 and
         current_price < swing_high and trend_1h != "up"
     )
 
@@ -188,10 +266,10 @@ def evaluate_direction(current_price: float, swing_high: float, swing_low: float
             direction = "SHORT"; reasons.append("Simple down breakout")
 
     # flat-breakout with volume
-    if direction is None and candle_stats["strong_body"] and candle_stats["volume_spike"]:
-        if current_price > swing_high + 0.1 * atr:
+    if direction is None and strong_volume:
+        if current_price > up_break:
             direction = "LONG"; reasons.append("Flat-breakout + volume")
-        elif current_price < swing_low - 0.1 * atr:
+        elif current_price < down_break:
             direction = "SHORT"; reasons.append("Flat-breakout + volume")
 
     return direction, reasons, in_middle
@@ -247,7 +325,7 @@ def assess_confidence(
         reasons.append(f"poc error: {e}")
         poc_val = None
 
-    print("[DEBUG] poc_val:", poc_val)
+    logger.debug("poc_val: %s", poc_val)
 
     if poc_val is not None:
         try:
@@ -296,7 +374,7 @@ def assess_confidence(
         reasons.extend(soft)
 
     result = round(confidence * 2) / 2
-    print("[DEBUG] final confidence:", result)
+    logger.debug("final confidence: %s", result)
     return result, reasons
 
 # ------------------------------------------------------------------
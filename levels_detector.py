@@ -1,28 +1,31 @@
-from statistics import mean
+import numpy as np
 from config import SWING_LOOKBACK
-from collections import Counter
 
 class LevelsDetector:
     def __init__(self, api):
         self.api = api
 
     def _cluster_level(self, values, tol_pct=0.15):
-        if not values:
+        if len(values) == 0:
             return None, 0
-        spread = max(values) - min(values)
+        arr = np.asarray(values, dtype=np.float64)
+        spread = np.ptp(arr)
         tol = spread * tol_pct or 1e-8  # ← защита от деления на 0
-        buckets = Counter(round(v / tol) for v in values)
-        most_common_bucket, freq = buckets.most_common(1)[0]
-        level_vals = [v for v in values if round(v / tol) == most_common_bucket]
-        return mean(level_vals), freq
+        buckets = np.round(arr / tol).astype(np.int64)
+        buckets -= buckets.min()
+        counts = np.bincount(buckets)
+        # on ties take the bucket seen first (Counter.most_common order)
+        best = buckets[np.argmax(counts[buckets] == counts.max())]
+        return float(arr[buckets == best].mean()), int(counts[best])
 
     def detect_swing_levels(self, symbol, interval="1h"):
         data = self.api.get_klines(symbol, interval, limit=SWING_LOOKBACK)
         if not data:
             return None
 
-        highs = [float(c[2]) for c in data]
-        lows  = [float(c[3]) for c in data]
+        arr   = np.asarray(data, dtype=np.float64)
+        highs = arr[:, 2]
+        lows  = arr[:, 3]
 
         swing_high, tests_high = self._cluster_level(highs)
         swing_low,  tests_low  = self._cluster_level(lows)
@@ -31,17 +34,15 @@ class LevelsDetector:
             return {}
 
         # 👇 ADDED: detecting the next level
-        next_highs = [h for h in highs if h > swing_high * 1.01]
-        next_lows  = [l for l in lows if l < swing_low * 0.99]
+        next_highs = highs[highs > swing_high * 1.01]
+        next_lows  = lows[lows < swing_low * 0.99]
 
         next_swing_high, _ = self._cluster_level(next_highs, tol_pct=0.10)
         next_swing_low, _  = self._cluster_level(next_lows, tol_pct=0.10)
 
         def _age(level, series):
-            for idx in range(len(series) - 1, -1, -1):
-                if abs(series[idx] - level) < 1e-8:
-                    return len(series) - idx
-            return len(series)
+            hits = np.flatnonzero(np.abs(series - level) < 1e-8)
+            return int(len(series) - hits[-1]) if hits.size else len(series)
 
         age_high = _age(swing_high, highs)
         age_low  = _age(swing_low,  lows)
@@ -4,6 +4,7 @@ from config import (
     DYNAMIC_ADJUSTMENT_MODE, DYNAMIC_TRIGGER_ATR, DYNAMIC_TRIGGER_PCT, 
     DYNAMIC_STEP_ATR
 )
+from utils.logger import logger
 
 def select_structural_limit(entry_price: float, atr: float,
                         swing_high: Optional[float] = None,
@@ -20,50 +21,33 @@ def select_structural_limit(entry_price: float, atr: float,
     if atr <= 0:
         raise ValueError("ATR must be > 0")
 
-    # 1️⃣ Trendline-based
-    if trendline_price:
-        buffer = 0.25 * atr
-        raw = trendline_price - buffer if side == "LONG" else trendline_price + buffer
-        dist = abs(entry_price - raw)
-        if dist < 6 * atr and ((side == "LONG" and raw < entry_price) or (side == "SHORT" and raw > entry_price)):
-            print(f"[DEBUG] ✅ Evaluation level selected from trendline: {raw:.5f}")
-            return raw
-        else:
-            print(f"[DEBUG] ❌ Trendline rejected: dist={dist:.5f} with ATR={atr:.5f}")
+    # sign points away from price: below entry for LONG, above for SHORT
+    sign = -1 if side == "LONG" else 1
+    buf = sign * 0.25 * atr
+    swing = swing_low if side == "LONG" else swing_high
 
-    # 2️⃣ Swing-level
-    if side == "LONG" and swing_low:
-        raw = swing_low * 0.997 - 0.25 * atr
-        dist = abs(entry_price - raw)
-        if raw < entry_price and dist < 3 * atr:
-            print(f"[DEBUG] ✅ Evaluation level selected from swing-low: {raw:.5f}")
-            return raw
-    elif side == "SHORT" and swing_high:
-        raw = swing_high * 1.003 + 0.25 * atr
-        dist = abs(entry_price - raw)
-        if raw > entry_price and dist < 3 * atr:
-            print(f"[DEBUG] ✅ Evaluation level selected from swing-high: {raw:.5f}")
-            return raw
-
-    # 3️⃣ POC-based
+    # (level, max distance in ATR, source) in priority order:
+    # 1️⃣ trendline, 2️⃣ swing-level, 3️⃣ POC, 4️⃣ low-volume zone exit
+    candidates = []
+    if trendline_price:
+        candidates.append((trendline_price + buf, 6, "trendline"))
+    if swing:
+        candidates.append((swing * (1 + sign * 0.003) + buf, 3,
+                           "swing-low" if side == "LONG" else "swing-high"))
     if poc:
-        raw = poc - 0.25 * atr if side == "LONG" else poc + 0.25 * atr
-        dist = abs(entry_price - raw)
-        if (side == "LONG" and raw < entry_price) or (side == "SHORT" and raw > entry_price):
-            if dist < 3 * atr:
-                print(f"[DEBUG] ✅ Evaluation level selected from POC: {raw:.5f}")
-                return raw
-
-    # 4️⃣ Low-volume zone exit
+        candidates.append((poc + buf, 3, "POC"))
     if low_volume_exit:
-        raw = low_volume_exit - 0.25 * atr if side == "LONG" else low_volume_exit + 0.25 * atr
+        candidates.append((low_volume_exit + buf, 3, "low-volume area exit"))
+
+    for raw, max_atr, source in candidates:
         dist = abs(entry_price - raw)
-        if (side == "LONG" and raw < entry_price) or (side == "SHORT" and raw > entry_price):
-            if dist < 3 * atr:
-                print(f"[DEBUG] ✅ Evaluation level selected from low-volume area exit: {raw:.5f}")
-                return raw
+        if sign * (raw - entry_price) > 0 and dist < max_atr * atr:
+            logger.debug("✅ Evaluation level selected from %s: %.5f", source, raw)
+            return raw
+        if source == "trendline":
+            logger.debug("❌ Trendline rejected: dist=%.5f with ATR=%.5f", dist, atr)
 
-    print(f"[DEBUG] ❌ No evaluation level found for {side} at price {entry_price:.4f}")
+    logger.debug("❌ No evaluation level found for %s at price %.4f", side, entry_price)
     return None
 
 
@@ -1,60 +1,124 @@
+import re
 import requests
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from requests.adapters import HTTPAdapter
+
+from utils.fastjson import loads
+
+# shared keep-alive session for the Binance/BingX polling calls
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
 
 # Cache for BingX contracts
 _cached_bingx_symbols = None
 _last_bingx_update = 0
 _CACHE_DURATION = 900  # 15 minutes
+_bingx_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bingx-contracts")
 
-def get_top_binance_symbols(limit=20):
-    # Fetching trading pairs list from Binance
-    url = "https://api.binance.com/api/v3/ticker/24hr"
-    response = requests.get(url)
+# Cache for the Binance 24hr ticker: reused as-is for _TICKER_TTL seconds,
+# then revalidated with If-None-Match (a 304 keeps the parsed payload)
+_cached_tickers = None
+_tickers_etag = None
+_last_tickers_update = 0
+_TICKER_TTL = 30  # seconds
+
+_cache_lock = threading.Lock()  # one refresh at a time, no double fetch
+
+# leveraged tokens and stablecoin pairs are excluded from the ranking
+_BLACKLIST_RE = re.compile(r"DOWN|UP|BUSD|FDUSD|TUSD|USDC|DAI")
+
+BINANCE_TICKER_URL = "https://api.binance.com/api/v3/ticker/24hr"
+BINGX_CONTRACTS_URL = "https://open-api.bingx.com/openApi/swap/v2/quote/contracts"
+
+
+def _fetch_bingx_contracts():
+    """
+    Returns a frozenset of BingX contract symbols, or None if the request failed.
+    """
+    print("🔁 Updating BingX contract list...")
+    try:
+        bingx_resp = loads(_SESSION.get(BINGX_CONTRACTS_URL, timeout=5).content)
+        if bingx_resp.get("code") != 0:
+            print("❌ BingX error:", bingx_resp)
+            return None
+        # interned: membership checks against interned candidates hit the identity fast path
+        return frozenset(sys.intern(item["symbol"]) for item in bingx_resp["data"])
+    except Exception as e:
+        print("❌ Error while requesting data from BingX:", e)
+        return None
+
+
+def _fetch_binance_tickers(now):
+    """
+    Returns the parsed Binance 24hr ticker list, or None if the request failed.
+    Must be called with _cache_lock held.
+    """
+    global _cached_tickers, _tickers_etag, _last_tickers_update
+    if _cached_tickers is not None and now - _last_tickers_update < _TICKER_TTL:
+        return _cached_tickers
+
+    headers = {"If-None-Match": _tickers_etag} if _tickers_etag and _cached_tickers is not None else {}
+    response = _SESSION.get(BINANCE_TICKER_URL, timeout=5, headers=headers)
+    if response.status_code == 304 and _cached_tickers is not None:
+        _last_tickers_update = now  # unchanged: no body to download or parse
+        return _cached_tickers
     if response.status_code != 200:
         print("⚠️ Error while fetching data from Binance")
-        return []
+        return None
 
-    data = response.json()
-    filtered = []
+    _cached_tickers = loads(response.content)
+    _tickers_etag = response.headers.get("ETag")
+    _last_tickers_update = now
+    return _cached_tickers
 
-    for item in data:
-        symbol = item["symbol"]
-        if not symbol.endswith("USDT") or any(x in symbol for x in ["DOWN", "UP", "BUSD", "FDUSD", "TUSD", "USDC", "DAI"]):
-            continue
 
-        price_change = float(item["priceChangePercent"])
-        volume = float(item["quoteVolume"])
+def get_top_binance_symbols(limit=20):
+    global _cached_bingx_symbols, _last_bingx_update
 
-        filtered.append({
-            "symbol": symbol.replace("USDT", "-USDT"),
-            "change": price_change,
-            "volume": volume
-        })
+    with _cache_lock:
+        # Fetching contract list from BingX (cached for 15 minutes). It doesn't
+        # depend on the Binance ticker, so a refresh runs while that downloads.
+        now = time.time()
+        bingx_refresh = None
+        if not _cached_bingx_symbols or now - _last_bingx_update > _CACHE_DURATION:
+            bingx_refresh = _bingx_pool.submit(_fetch_bingx_contracts)
 
-    # Sorting by trading volume and price volatility
-    sorted_symbols = sorted(filtered, key=lambda x: (x["volume"], abs(x["change"])), reverse=True)
-    top_symbols = [s["symbol"] for s in sorted_symbols[:limit * 2]]
+        # Fetching trading pairs list from Binance
+        data = _fetch_binance_tickers(now)
 
-    # Fetching contract list from BingX (cached for 15 minutes)
-    global _cached_bingx_symbols, _last_bingx_update
-    now = time.time()
-
-    if not _cached_bingx_symbols or now - _last_bingx_update > _CACHE_DURATION:
-        print("🔁 Updating BingX contract list...")
-        bingx_url = "https://open-api.bingx.com/openApi/swap/v2/quote/contracts"
-        try:
-            bingx_resp = requests.get(bingx_url).json()
-            if bingx_resp.get("code") != 0:
-                print("❌ BingX error:", bingx_resp)
+        if bingx_refresh is not None:
+            contracts = bingx_refresh.result()
+            if contracts is None:
                 return []
-            _cached_bingx_symbols = set(item["symbol"] for item in bingx_resp["data"])
+            _cached_bingx_symbols = contracts
             _last_bingx_update = now
-        except Exception as e:
-            print("❌ Error while requesting data from BingX:", e)
-            return []
+        bingx_symbols = _cached_bingx_symbols
+
+    if data is None:
+        return []
+
+    rows = [
+        item for item in data
+        if item["symbol"].endswith("USDT") and not _BLACKLIST_RE.search(item["symbol"])
+    ]
+
+    # numeric fields are parsed straight into preallocated float64 columns
+    n = len(rows)
+    volumes = np.fromiter((item["quoteVolume"] for item in rows), dtype=np.float64, count=n)
+    changes = np.fromiter((item["priceChangePercent"] for item in rows), dtype=np.float64, count=n)
+
+    # Sorting by trading volume, then price volatility (both descending).
+    # lexsort is stable, so ties keep ticker order exactly like sorted(reverse=True).
+    order = np.lexsort((-np.abs(changes), -volumes))
+    top_symbols = [sys.intern(rows[i]["symbol"].replace("USDT", "-USDT")) for i in order[:limit * 2]]
 
     # Filtering using cache
-    valid_symbols = [s for s in top_symbols if s in _cached_bingx_symbols]
+    valid_symbols = [s for s in top_symbols if s in bingx_symbols]
 
     print(f"🔍 All selected coins from Binance (top-{limit * 2}):", top_symbols)
     print(f"✅ Passed BingX filter:", valid_symbols[:limit])
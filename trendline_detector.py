@@ -1,4 +1,5 @@
-from typing import List, Tuple, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Dict, Optional, Union
 import numpy as np
 
 class TrendlineDetector:
@@ -8,35 +9,49 @@ class TrendlineDetector:
         self.min_slope = min_slope
         self.tolerance_pct = tolerance_pct
 
-    def _find_trendline(self, prices: List[float], kind: str = "high") -> Optional[Dict]:
-        n = len(prices)
-        for i in range(n):
-            for j in range(i + 3, n):
-                x1, x2 = i, j
-                y1, y2 = prices[i], prices[j]
-                slope = (y2 - y1) / (x2 - x1)
-
-                if kind == "high" and slope >= -self.min_slope:
-                    continue
-                if kind == "low" and slope <= self.min_slope:
-                    continue
-
-                hits = 0
-                for k in range(i + 1, j):
-                    y_k = y1 + slope * (k - x1)
-                    price_k = prices[k]
-                    diff_pct = abs(price_k - y_k) / y_k
-                    if diff_pct < self.tolerance_pct:
-                        hits += 1
-
-                if hits >= self.min_touches - 2:
-                    return {
-                        "slope": slope,
-                        "points": [(x1, y1), (x2, y2)],
-                        "touches": hits + 2,
-                        "age": n - x2,
-                        "price_now": y2 + slope * (n - x2)
-                    }
+    def _find_trendline(self, prices: Union[List[float], np.ndarray], kind: str = "high") -> Optional[Dict]:
+        p = np.asarray(prices, dtype=np.float64)
+        n = p.size
+        k = np.arange(n)
+
+        # One anchor i per step, vectorised over every second anchor j >= i + 3
+        # and the points between them; stop at the first anchor with a match,
+        # so an early trendline doesn't pay for the whole O(n^3) search.
+        for i in range(n - 3):
+            j = k[i + 3:]
+            slope = (p[j] - p[i]) / (j - i)
+
+            if kind == "high":
+                valid = slope < -self.min_slope
+            elif kind == "low":
+                valid = slope > self.min_slope
+            else:
+                valid = np.ones(slope.size, dtype=bool)
+            if not valid.any():
+                continue
+            j, slope = j[valid], slope[valid]
+
+            # touches: points strictly between the anchors within tolerance of the line
+            inner = k[i + 1:n - 1]
+            y_line = p[i] + slope[:, None] * (inner - i)
+            near = np.abs(p[i + 1:n - 1] - y_line) / y_line < self.tolerance_pct
+            near &= inner < j[:, None]
+            hits = np.count_nonzero(near, axis=1)
+
+            found = hits >= self.min_touches - 2
+            if not found.any():
+                continue
+            first = int(np.argmax(found))
+            x1, x2 = i, int(j[first])
+            y1, y2 = float(p[x1]), float(p[x2])
+            slope = float(slope[first])
+            return {
+                "slope": slope,
+                "points": [(x1, y1), (x2, y2)],
+                "touches": int(hits[first]) + 2,
+                "age": n - x2,
+                "price_now": y2 + slope * (n - x2)
+            }
 
         return None
 
@@ -45,8 +60,10 @@ class TrendlineDetector:
         if not klines or len(klines) < 10:
             return {}
 
-        highs = [float(k[2]) for k in klines]
-        lows = [float(k[3]) for k in klines]
+        # one float64 conversion; contiguous columns for the trendline scan
+        arr = np.asarray(klines, dtype=np.float64)
+        highs = arr[:, 2].copy()
+        lows = arr[:, 3].copy()
 
         down = self._find_trendline(highs, kind="high")
         up = self._find_trendline(lows, kind="low")
@@ -57,11 +74,14 @@ class TrendlineDetector:
         }
 
     def detect_trendlines_multi(self, symbol: str, lookbacks: Dict[str, int] = {"15m": 50, "1h": 50}) -> Dict[str, Dict[str, Dict]]:
-        result = {}
-        for interval, lb in lookbacks.items():
-            trendlines = self.detect_trendlines(symbol, interval=interval, lookback=lb)
-            result[interval] = trendlines
-        return result
+        # timeframes are independent klines requests: fetch them side by side
+        # (repeat lookups within a cycle are served by get_klines' TTL cache)
+        with ThreadPoolExecutor(max_workers=len(lookbacks) or 1) as pool:
+            futures = {
+                interval: pool.submit(self.detect_trendlines, symbol, interval=interval, lookback=lb)
+                for interval, lb in lookbacks.items()
+            }
+            return {interval: future.result() for interval, future in futures.items()}
 
     def detect_combined_levels(self, symbol: str, levels: Dict[str, object]) -> Dict[str, object]:
         """
@@ -76,19 +96,35 @@ class TrendlineDetector:
         })
         return levels
 
-    def check_trendline_breakout(self, current_price: float, direction: str, key_levels: Dict[str, object]) -> List[str]:
-        reasons = []
-        if direction == "LONG":
-            for tf in ["15m", "1h"]:
-                up = key_levels.get(f"trendline_{tf}_up")
-                if up and current_price > up.get("price_now", float("inf")):
-                    reasons.append(f"breakout of upward trendline {tf}")
-        elif direction == "SHORT":
-            for tf in ["15m", "1h"]:
-                down = key_levels.get(f"trendline_{tf}_down")
-                if down and current_price < down.get("price_now", float("-inf")):
-                    reasons.append(f"breakout of downward trendline {tf}")
-        return reasons
+    @staticmethod
+    def flatten_trendlines(lines: Dict[Tuple[str, str], Optional[Dict]]) -> Tuple[Tuple[str, int, float, str], ...]:
+        """
+        Turns {(tf, "up"|"down"): trendline} into one (direction, sign, price_now, reason)
+        entry per existing trendline, ordered 15m then 1h.
+        """
+        flat = []
+        for tf in ("15m", "1h"):
+            up = lines.get((tf, "up"))
+            if up and "price_now" in up:
+                flat.append(("LONG", 1, up["price_now"], f"breakout of upward trendline {tf}"))
+            down = lines.get((tf, "down"))
+            if down and "price_now" in down:
+                flat.append(("SHORT", -1, down["price_now"], f"breakout of downward trendline {tf}"))
+        return tuple(flat)
+
+    def check_trendline_breakout(self, current_price: float, direction: str,
+                                 key_levels: Dict[str, object],
+                                 flat: Optional[Tuple[Tuple[str, int, float, str], ...]] = None) -> List[str]:
+        if flat is None:
+            flat = self.flatten_trendlines({
+                (tf, side): key_levels.get(f"trendline_{tf}_{side}")
+                for tf in ("15m", "1h") for side in ("up", "down")
+            })
+        # sign * price turns "above" (LONG) and "below" (SHORT) into one comparison
+        return [
+            reason for side, sign, price_now, reason in flat
+            if side == direction and sign * current_price > sign * price_now
+        ]
 
     def get_trendline_value_at_index(self, trendline: dict, index: int) -> Optional[float]:
         if not trendline or "points" not in trendline or "slope" not in trendline:
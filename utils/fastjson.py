@@ -0,0 +1,8 @@
+# utils/fastjson.py — JSON decoding with an optional orjson fast path
+
+try:
+    from orjson import loads  # C/Rust parser, 2-5x faster than stdlib json
+except ImportError:
+    from json import loads  # orjson is optional
+
+# Both parsers raise a ValueError subclass on malformed input.
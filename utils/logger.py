@@ -1,7 +1,61 @@
+import atexit
 import csv
 import os
+import threading
+import time
 from datetime import datetime
 
+_SIGNAL_LOCK = threading.Lock()  # symbols are analysed concurrently in main
+
+# today's signals file stays open; rolled over when the UTC date changes
+_signal_date = None
+_signal_fh = None
+_signal_writer = None
+
+# (unix second, UTC ISO timestamp) of the last formatted row time
+_signal_ts = (None, "")
+
+
+def _open_signal_log(date_str, fieldnames):
+    """
+    Closes the previous day's file (if any) and opens signals_<date>.csv for appending.
+    """
+    global _signal_date, _signal_fh, _signal_writer
+    if _signal_fh is not None:
+        _signal_fh.close()
+
+    # Filename in the format signals_2025-04-13.csv
+    filename = f"signals_{date_str}.csv"
+    _signal_fh = open(filename, mode="a", newline='', encoding="utf-8")
+    _signal_writer = csv.DictWriter(_signal_fh, fieldnames=fieldnames)
+    if _signal_fh.tell() == 0:  # append mode starts at EOF: empty means new file
+        _signal_writer.writeheader()
+    _signal_date = date_str
+
+
+def _utc_timestamp():
+    """
+    Returns the current UTC time as an ISO string, reformatted at most once per second.
+    """
+    global _signal_ts
+    sec = int(time.time())
+    cached_sec, iso = _signal_ts
+    if sec != cached_sec:
+        iso = datetime.utcfromtimestamp(sec).isoformat()
+        _signal_ts = (sec, iso)  # one tuple swap keeps second/string consistent
+    return iso
+
+
+def _close_signal_log():
+    global _signal_date, _signal_fh, _signal_writer
+    with _SIGNAL_LOCK:
+        if _signal_fh is not None:
+            _signal_fh.close()
+        _signal_date = _signal_fh = _signal_writer = None
+
+
+atexit.register(_close_signal_log)
+
 def log_signal(result, symbol, entry):
     if result["status"] == "ignore":
         return  # Skipping irrelevant signals
@@ -9,12 +63,12 @@ def log_signal(result, symbol, entry):
     if result.get("confidence", 0) == 0:
         return  # Skipping weak signals
 
-    # Filename in the format signals_2025-04-13.csv
-    date_str = datetime.utcnow().strftime("%Y-%m-%d")
-    filename = f"signals_{date_str}.csv"
+    # filename date and row timestamp come from the same instant
+    timestamp = _utc_timestamp()
+    date_str = timestamp[:10]
 
     data = {
-        "datetime": datetime.utcnow().isoformat(),
+        "datetime": timestamp,
         "symbol": symbol,
         "direction": result["scenario_bias"], #'direction' means bias assessment (not a trade signal)
         "status": result["status"],
@@ -27,28 +81,48 @@ def log_signal(result, symbol, entry):
         "mode": result.get("market_mode", "unknown")
     }
 
-    file_exists = os.path.isfile(filename)
-    with open(filename, mode="a", newline='', encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=data.keys())
-        if not file_exists:
-            writer.writeheader()
-        writer.writerow(data)
+    with _SIGNAL_LOCK:
+        if date_str != _signal_date:
+            _open_signal_log(date_str, data.keys())
+        _signal_writer.writerow(data)
+        # the bot is usually stopped by a signal, so don't hold rows in memory
+        _signal_fh.flush()
         
 def debug_entry_log(symbol, result, atr, volume_spike):
-    print(f"📊 {symbol} | Status: {result['status'].upper()} | Confidence: {result.get('confidence', '-')}")
-    print(f"    Direction: {result.get('direction', '-')}")
-    print(f"    Market mode: {result.get('market_mode', '-')}")
-    print(f"    RR: {result.get('rr', '-')}, ATR: {atr:.4f}")
-    print(f"    Volume spike: {volume_spike}")
-    print(f"    Reasons: {result.get('reason', '-')}")
+    if not logger.isEnabledFor(logging.DEBUG):
+        return  # skip building the summary at INFO and above
+    # one record, so lines from concurrently analysed symbols don't interleave
+    logger.debug(
+        "📊 %s | Status: %s | Confidence: %s\n"
+        "    Direction: %s\n"
+        "    Market mode: %s\n"
+        "    RR: %s, ATR: %.4f\n"
+        "    Volume spike: %s\n"
+        "    Reasons: %s",
+        symbol, result['status'].upper(), result.get('confidence', '-'),
+        result.get('direction', '-'),
+        result.get('market_mode', '-'),
+        result.get('rr', '-'), atr,
+        volume_spike,
+        result.get('reason', '-'),
+    )
 
 import logging
+import logging.handlers
+import queue
 
 logger = logging.getLogger("level_bot")
-logger.setLevel(logging.INFO)
+logger.setLevel(os.environ.get("LEVELBOT_LOG_LEVEL", "INFO").upper())
 
 handler = logging.StreamHandler()
-formatter = logging.Formatter('%(asctime)s — %(levelname)s — %(message)s')
+formatter = logging.Formatter('%(asctime)s — %(levelname)s — %(message)s', datefmt='%H:%M:%S', style='%')
 handler.setFormatter(formatter)
 
-logger.addHandler(handler)
+# Worker threads only enqueue records; a background listener formats and
+# writes them, so a logging call never blocks on stdout.
+_log_queue = queue.SimpleQueue()
+_listener = logging.handlers.QueueListener(_log_queue, handler)
+_listener.start()
+atexit.register(_listener.stop)
+
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
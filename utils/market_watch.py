@@ -1,11 +1,18 @@
 # utils/market_watch.py  (новый файл)
-import requests, time
+import requests, sys, time
 from collections import deque
+from requests.adapters import HTTPAdapter
+
+from utils.fastjson import loads
+
+# reused across scan cycles so each poll skips the TCP/TLS handshake
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
 
 BINANCE_TICKER_24H = "https://api.binance.com/api/v3/ticker/24hr"
 
 def top_liquid_pairs(limit=20):
-    data = requests.get(BINANCE_TICKER_24H, timeout=5).json()
+    data = loads(_SESSION.get(BINANCE_TICKER_24H, timeout=5).content)
     # filter only USDT pairs and sort by volume quote
     liquid = sorted(
         (d for d in data if d["symbol"].endswith("USDT")),
@@ -21,12 +28,16 @@ class VolatilityGuard:
         self.cool_off = cool_off
         self.last_trigger = 0
         self.window = deque(maxlen=60)   # 1-minute ATR history
+        self._window_sum = 0.0           # running sum of self.window
 
     def push(self, atr_1m):
+        if len(self.window) == self.window.maxlen:
+            self._window_sum -= self.window[0]   # about to be evicted
         self.window.append(atr_1m)
+        self._window_sum += atr_1m
         if len(self.window) < 60:        # wait for one hour of historical data
             return False
-        atr_hour = sum(self.window)/60
+        atr_hour = self._window_sum/60
         if atr_1m > atr_hour * self.max_factor:
             self.last_trigger = time.time()
             return True
@@ -35,16 +46,16 @@ class VolatilityGuard:
     def in_cool_off(self):
         return (time.time() - self.last_trigger) < self.cool_off
 
-def bingx_supported_symbols() -> set[str]:
+def bingx_supported_symbols() -> frozenset[str]:
     """
-    Returns a set of all BingX contracts like BTC-USDT, ETH-USDT, etc.
+    Returns a frozenset of all BingX contracts like BTC-USDT, ETH-USDT, etc.
     """
     url = "https://open-api.bingx.com/openApi/swap/v2/quote/contracts"
     try:
-        response = requests.get(url, timeout=5)
+        response = _SESSION.get(url, timeout=5)
         response.raise_for_status()
-        data = response.json().get("data", [])
-        return {entry["symbol"] for entry in data if "symbol" in entry}
+        data = loads(response.content).get("data", [])
+        return frozenset(sys.intern(entry["symbol"]) for entry in data if "symbol" in entry)
     except Exception as e:
         print(f"⚠️ Error fetching contract list from BingX: {e}")
-        return set()
+        return frozenset()
@@ -1,12 +1,29 @@
 # utils/telegram.py — safe version
 
+import atexit
+import queue
+import threading
+
 import requests
+from requests.adapters import HTTPAdapter
 from config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
 
-def send_message(text):
-    if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
-        return  # Not configured — do not send
+# keeps the Telegram connection warm between messages
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+
+# send_message only enqueues; a background worker does the HTTP round trips
+_TG_QUEUE = queue.Queue(maxsize=1000)
+_BATCH_MAX_MESSAGES = 20
+_BATCH_MAX_CHARS = 4096  # Telegram's sendMessage text limit
+_EXIT_TIMEOUT = 10  # seconds the exit hook waits for queued messages to go out
+_STOP = object()  # queued at exit: the worker sends everything before it, then returns
+
+_worker = None
+_worker_lock = threading.Lock()
 
+
+def _post(text):
     url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
     payload = {
         "chat_id": TELEGRAM_CHAT_ID,
@@ -14,9 +31,68 @@ def send_message(text):
         "parse_mode": "HTML"
     }
     try:
-        response = requests.post(url, data=payload, timeout=5)
+        response = _SESSION.post(url, data=payload, timeout=5)
         if response.status_code != 200:
             print(f"❗Telegram error: {response.status_code} {response.text}")
     except Exception as e:
         print(f"❗️Telegram exception: {e}")
 
+
+def _drain(first):
+    """
+    Collects `first` plus whatever is already queued into one newline-joined
+    message. Returns (text, leftover) where leftover didn't fit the size limit
+    or is the _STOP sentinel.
+    """
+    batch, size = [first], len(first)
+    while len(batch) < _BATCH_MAX_MESSAGES:
+        try:
+            text = _TG_QUEUE.get_nowait()
+        except queue.Empty:
+            break
+        if text is _STOP or size + 1 + len(text) > _BATCH_MAX_CHARS:
+            return "\n".join(batch), text
+        batch.append(text)
+        size += 1 + len(text)
+    return "\n".join(batch), None
+
+
+def _tg_worker():
+    leftover = None
+    while True:
+        first = leftover if leftover is not None else _TG_QUEUE.get()
+        if first is _STOP:
+            return
+        text, leftover = _drain(first)
+        _post(text)
+
+
+def _stop_worker():
+    # The worker is a daemon thread and may already hold a batch or a leftover
+    # message, so let it finish the queue up to the sentinel instead of
+    # draining behind its back.
+    try:
+        _TG_QUEUE.put(_STOP, timeout=_EXIT_TIMEOUT)
+    except queue.Full:
+        return
+    _worker.join(timeout=_EXIT_TIMEOUT)
+
+
+def _ensure_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_tg_worker, name="telegram-sender", daemon=True)
+            _worker.start()
+            atexit.register(_stop_worker)
+
+
+def send_message(text):
+    if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
+        return  # Not configured — do not send
+
+    _ensure_worker()
+    try:
+        _TG_QUEUE.put_nowait(text)
+    except queue.Full:
+        print("❗Telegram queue is full — message dropped")
@@ -1,19 +1,58 @@
-# utils/volume_profile.py — Volume Profile calculation (to be added in v1.1)
+# utils/volume_profile.py — Volume Profile calculation (POC, Value Area High/Low)
 
-def calculate_volume_profile(candles):
+import numpy as np
+
+VALUE_AREA_SHARE = 0.7  # share of total volume inside the value area
+
+
+def calculate_volume_profile(candles, num_bins=24):
     """
-    🔥 TODO:
-    1. Calculate volume distribution across price zones
-    2. Identify the POC (Point of Control)
-    3. Determine VAH and VAL (Value Area High/Low)
-    4. Return key levels
+    Distributes candle volume across price zones and returns key levels:
+    1. POC (Point of Control) — midpoint of the zone with the most volume
+    2. VAH / VAL — bounds of the value area holding 70% of the volume,
+       grown outward from the POC towards the heavier neighbouring zone
 
-    candles: List of candles with volume data
+    candles: List of candles with volume data (Binance kline layout:
+             [open_time, open, high, low, close, volume, ...])
     """
-    # Code will go here
+    empty = {"POC": None, "VAH": None, "VAL": None}
+    if len(candles) == 0:
+        return empty
+
+    arr = np.asarray(candles, dtype=np.float64)
+    tp = (arr[:, 2] + arr[:, 3] + arr[:, 4]) / 3  # typical price
+    volume = arr[:, 5]
+
+    lo_price, hi_price = tp.min(), tp.max()
+    if lo_price == hi_price:  # a single price level: nothing to bin
+        price = float(lo_price)
+        return {"POC": price, "VAH": price, "VAL": price}
+
+    hist, edges = np.histogram(tp, bins=num_bins, range=(lo_price, hi_price), weights=volume)
+    total = hist.sum()
+    if total <= 0:
+        return empty
+
+    poc_idx = int(hist.argmax())
+
+    # Value area: starting at the POC, absorb whichever neighbour holds more
+    # volume until the target share is covered (at most num_bins steps).
+    target = VALUE_AREA_SHARE * total
+    vols = hist.tolist()
+    lo = hi = poc_idx
+    covered = vols[poc_idx]
+    while covered < target and (lo > 0 or hi < num_bins - 1):
+        below = vols[lo - 1] if lo > 0 else -1.0
+        above = vols[hi + 1] if hi < num_bins - 1 else -1.0
+        if above >= below:
+            hi += 1
+            covered += above
+        else:
+            lo -= 1
+            covered += below
+
     return {
-        "POC": None,
-        "VAH": None,
-        "VAL": None
+        "POC": float((edges[poc_idx] + edges[poc_idx + 1]) / 2),
+        "VAH": float(edges[hi + 1]),
+        "VAL": float(edges[lo]),
     }
- 